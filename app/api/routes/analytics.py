@@ -42,6 +42,8 @@ def _run_analysis(job_id: str, opponent_id: str, payload_dict: dict) -> None:
         identity_service = OpponentIdentityService()
         games = list(db.scalars(select(Game).where(Game.opponent_space_id == opponent_id)).all())
 
+        # Identity inference and opening detection share the games but not
+        # each other's outputs — one pass over the games does both.
         for game in games:
             result = identity_service.infer_side(
                 canonical_name=opponent.canonical_name,
@@ -51,7 +53,6 @@ def _run_analysis(job_id: str, opponent_id: str, payload_dict: dict) -> None:
             game.opponent_name_in_game = result.matched_name
             game.opponent_side = result.opponent_side
 
-        for game in games:
             moves = list(
                 db.scalars(
                     select(MoveFact)
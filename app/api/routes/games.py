@@ -38,10 +38,17 @@ def get_game(game_id: str, db: Session = Depends(get_db)) -> Game:
     return game
 
 
+# The sub-resource endpoints only need to know the game exists — a scalar ID
+# probe instead of db.get(Game, ...), which hydrates the whole row including
+# the PGN text just to 404-check before the real query.
+
+def _game_exists(db: Session, game_id: str) -> bool:
+    return db.scalar(select(Game.id).where(Game.id == game_id)) is not None
+
+
 @router.get("/games/{game_id}/moves", response_model=list[MoveFactRead])
 def get_game_moves(game_id: str, db: Session = Depends(get_db)) -> list[MoveFact]:
-    game = db.get(Game, game_id)
-    if not game:
+    if not _game_exists(db, game_id):
         raise HTTPException(status_code=404, detail="Game not found")
 
     stmt = select(MoveFact).where(MoveFact.game_id == game_id).order_by(MoveFact.ply.asc())
@@ -50,8 +57,7 @@ def get_game_moves(game_id: str, db: Session = Depends(get_db)) -> list[MoveFact
 
 @router.get("/games/{game_id}/analysis", response_model=list[EngineAnalysisRead])
 def get_game_analysis(game_id: str, db: Session = Depends(get_db)) -> list[EngineAnalysis]:
-    game = db.get(Game, game_id)
-    if not game:
+    if not _game_exists(db, game_id):
         raise HTTPException(status_code=404, detail="Game not found")
 
     stmt = select(EngineAnalysis).where(EngineAnalysis.game_id == game_id).order_by(EngineAnalysis.ply.asc())
@@ -60,8 +66,7 @@ def get_game_analysis(game_id: str, db: Session = Depends(get_db)) -> list[Engin
 
 @router.post("/games/{game_id}/analyze", response_model=AnalyzeGameResponse)
 def analyze_game(game_id: str, payload: AnalyzeGameRequest, db: Session = Depends(get_db)) -> AnalyzeGameResponse:
-    game = db.get(Game, game_id)
-    if not game:
+    if not _game_exists(db, game_id):
         raise HTTPException(status_code=404, detail="Game not found")
 
     service = AnalysisService()
@@ -1,4 +1,5 @@
 import urllib.error
+from operator import attrgetter
 
 from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, UploadFile
 from pydantic import BaseModel
@@ -7,7 +8,7 @@ from sqlalchemy.orm import Session
 from app.db.models import Job, JobStatus, JobType, OpponentSpace
 from app.dependencies import get_db
 from app.schemas.jobs import JobRead
-from app.services.imports.chessbase_fetcher import fetch_pgn, parse_player_slug
+from app.services.imports.chessbase_fetcher import fetch_pgn
 from app.services.imports.chesscom_fetcher import fetch_pgn as chesscom_fetch_pgn
 from app.services.imports.platform_search import build_player_profile, search_all
 from app.services.jobs.import_jobs import process_pgn_import_job
@@ -261,7 +262,7 @@ def list_import_jobs(opponent_id: str, db: Session = Depends(get_db)) -> list[Jo
     opponent = db.get(OpponentSpace, opponent_id)
     if not opponent:
         raise HTTPException(status_code=404, detail="Opponent space not found")
-    return sorted(opponent.jobs, key=lambda j: j.created_at, reverse=True)
+    return sorted(opponent.jobs, key=attrgetter("created_at"), reverse=True)
 
 
 @router.post("/auto", response_model=list[JobRead])
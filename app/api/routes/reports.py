@@ -8,10 +8,14 @@ Flow:
 """
 from __future__ import annotations
 
+import hashlib
 import logging
+from itertools import chain
+from typing import TYPE_CHECKING, Iterable
 from uuid import uuid4
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
 from app.db.models import OpponentSpace, Report
@@ -19,7 +23,11 @@ from app.db.session import SessionLocal
 from app.dependencies import get_db
 from app.schemas.reports import ChatRequest, ReportRead, ReportRequest, ResumeRequest, TranslateRequest
 from app.services.agent import prompts, retrieval as retrieval_svc
-from app.services.agent.graph import PrepState, _get_chat_llm, prep_graph
+# The graph module pulls in the whole langchain/langgraph stack and compiles
+# the pipeline — deferred to the handlers that actually run it so importing
+# this router (and therefore app startup) stays cheap.
+if TYPE_CHECKING:
+    from app.services.agent.graph import PrepState
 
 logger = logging.getLogger(__name__)
 
@@ -33,8 +41,10 @@ router = APIRouter(
 # Background task helpers
 # ---------------------------------------------------------------------------
 
-def _run_orchestrator(report_id: str, thread_id: str, initial_state: PrepState) -> None:
+def _run_orchestrator(report_id: str, thread_id: str, initial_state: "PrepState") -> None:
     """Run orchestrator node → interrupt (saves plan to Report, status=awaiting_review)."""
+    from app.services.agent.graph import prep_graph
+
     db = SessionLocal()
     try:
         config = {"configurable": {"thread_id": thread_id}}
@@ -66,26 +76,43 @@ _AGENT_LABELS = {
 _PARALLEL_AGENTS = {"scouting", "pattern", "psychology"}
 
 
-def _write_progress(db: Session, report_id: str, node: str) -> None:
+# The pipeline background task is the report's only writer while it runs, so
+# progress writes work off a content dict the task owns instead of re-reading
+# the row each time: a commit expires the ORM instance, which would turn every
+# helper call into a SELECT + UPDATE round-trip.  These helpers issue one
+# targeted UPDATE each.
+
+def _write_progress(db: Session, report_id: str, content: dict, node: str) -> None:
     """Persist per-node progress into report.content without touching status."""
-    report = db.get(Report, report_id)
-    if not report:
-        return
-    existing = report.content or {}
-    existing[f"{node}_done"] = True
+    content[f"{node}_done"] = True
     # Only show a label for synthesis (sequential); parallel agents show via done flags
     if node not in _PARALLEL_AGENTS:
-        existing["current_agent"] = node
-        existing["current_agent_label"] = _AGENT_LABELS.get(node, node)
-    report.content = dict(existing)
+        content["current_agent"] = node
+        content["current_agent_label"] = _AGENT_LABELS.get(node, node)
+    db.execute(update(Report).where(Report.id == report_id).values(content=dict(content)))
+    db.commit()
+
+
+# Persist the partial narrative every this many streamed tokens.
+_PARTIAL_WRITE_EVERY = 40
+
+
+def _write_partial_narrative(db: Session, report_id: str, content: dict, text: str) -> None:
+    """Persist the partially generated synthesis narrative for polling UIs."""
+    # Cut at the tree sentinel so half-built JSON never reaches the UI
+    content["partial_narrative"] = text.split("---OPENING_TREE---", 1)[0]
+    db.execute(update(Report).where(Report.id == report_id).values(content=dict(content)))
     db.commit()
 
 
 def _run_pipeline(report_id: str, thread_id: str, plan_override: dict | None) -> None:
     """Resume graph from checkpoint: scouting → pattern → psychology → synthesis."""
+    from app.services.agent.graph import prep_graph
+
     db = SessionLocal()
     try:
         report = db.get(Report, report_id)
+        content: dict = dict(report.content or {}) if report else {}
         if report:
             report.status = "running"
             db.commit()
@@ -95,20 +122,36 @@ def _run_pipeline(report_id: str, thread_id: str, plan_override: dict | None) ->
         if plan_override:
             prep_graph.update_state(config, {"strategy_plan": plan_override})
 
-        # stream(stream_mode="updates") yields {node_name: state_updates} after
-        # each node completes — accumulate into result and write progress each time.
+        # "updates" yields {node_name: state_updates} after each node completes;
+        # "messages" yields LLM tokens as they generate.  Forwarding synthesis
+        # tokens into report.content lets the polling UI show the narrative
+        # growing instead of a spinner for the whole final-report generation.
         result: dict = {}
-        for chunk in prep_graph.stream(None, config, stream_mode="updates"):
+        narrative_parts: list[str] = []
+        tokens_since_write = 0
+        for mode, chunk in prep_graph.stream(
+            None, config, stream_mode=["updates", "messages"]
+        ):
+            if mode == "messages":
+                message, metadata = chunk
+                token_text = getattr(message, "content", "")
+                if metadata.get("langgraph_node") == "synthesis" and isinstance(token_text, str) and token_text:
+                    narrative_parts.append(token_text)
+                    tokens_since_write += 1
+                    if tokens_since_write >= _PARTIAL_WRITE_EVERY:
+                        tokens_since_write = 0
+                        _write_partial_narrative(db, report_id, content, "".join(narrative_parts))
+                continue
             for node_name, updates in chunk.items():
                 result.update(updates)
-                _write_progress(db, report_id, node_name)
+                _write_progress(db, report_id, content, node_name)
 
         report = db.get(Report, report_id)
         if report:
-            existing_content = report.content or {}
             report.content = {
-                **existing_content,
+                **content,
                 "current_agent": None,
+                "partial_narrative": None,
                 "scouting_report": result.get("scouting_report", {}),
                 "pattern_report": result.get("pattern_report", {}),
                 "psychology_report": result.get("psychology_report", {}),
@@ -176,7 +219,7 @@ def generate_report(
     # Gather quick summary synchronously (fast DB read) so it's in the state
     quick_summary = retrieval_svc.get_quick_summary(db, opponent_id)
 
-    initial_state: PrepState = {
+    initial_state: "PrepState" = {
         "opponent_space_id": opponent_id,
         "risk_mode": req.risk_mode,
         "quick_summary": quick_summary,
@@ -271,21 +314,31 @@ _GT_LANG_CODES: dict[str, str] = {
 }
 
 
-def _gt(text: str, target: str) -> str:
-    """Translate a non-empty string via Google Translate. Returns original on empty."""
-    if not text or not text.strip():
-        return text
-    from deep_translator import GoogleTranslator
-    return GoogleTranslator(source="auto", target=target).translate(text) or text
-
+def _gt_many(texts: Iterable[str], target: str) -> list[str]:
+    """Translate many strings in one batched call, preserving order.
 
-def _gt_list(items: list, target: str) -> list:
-    """Translate a list of strings via Google Translate."""
-    if not items:
-        return items
+    Empty/whitespace entries pass through untranslated.  One translator and
+    one batch call for the whole report instead of a client + HTTP round
+    trip per field.  Accepts any iterable so callers can feed a chain of
+    field groups without materializing an intermediate list.
+    """
+    out = list(texts)
+    idx = [i for i, t in enumerate(out) if t and t.strip()]
+    if not idx:
+        return out
     from deep_translator import GoogleTranslator
     translator = GoogleTranslator(source="auto", target=target)
-    return [translator.translate(item) or item for item in items if item]
+    translated = translator.translate_batch([out[i] for i in idx])
+    for i, t in zip(idx, translated):
+        out[i] = t or out[i]
+    return out
+
+
+# Translated payload per (report, language) — report content is immutable
+# once status == "ready", so switching languages back and forth in the UI
+# should not re-pay the Google Translate round trips each time.
+_translation_cache: dict[tuple[str, str], dict] = {}
+_TRANSLATION_CACHE_MAX = 32
 
 
 @router.post("/{report_id}/translate")
@@ -304,6 +357,11 @@ def translate_report(
 
     lang_code = _GT_LANG_CODES.get(req.target_language, req.target_language)
 
+    cache_key = (report.id, lang_code)
+    cached = _translation_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     content = report.content or {}
     narrative = content.get("narrative", "") or content.get("markdown", "") or ""
     plan = content.get("plan") or {}
@@ -311,39 +369,116 @@ def translate_report(
     pattern = content.get("pattern_report") or {}
     psychology = content.get("psychology_report") or {}
 
+    focus_areas = [x for x in plan.get("focus_areas") or [] if x]
+    key_findings = [x for x in scouting.get("key_findings") or [] if x]
+    structural = [x for x in pattern.get("structural_tendencies") or [] if x]
+    recurring = [x for x in pattern.get("recurring_error_patterns") or [] if x]
+    exploit_positions = [x for x in pattern.get("exploit_positions") or [] if x]
+
+    scalars = [
+        narrative,
+        plan.get("phase_weakness") or "",
+        plan.get("prep_priority") or "",
+        plan.get("risk_notes") or "",
+        scouting.get("time_pressure_insight") or "",
+        scouting.get("rating_insight") or "",
+        psychology.get("psychological_profile") or "",
+        psychology.get("exploit_strategy") or "",
+        psychology.get("color_insight") or "",
+        psychology.get("fatigue_insight") or "",
+    ]
+
     try:
-        return {
-            "narrative": _gt(narrative, lang_code),
+        translated = iter(
+            _gt_many(
+                chain(scalars, focus_areas, key_findings, structural, recurring, exploit_positions),
+                lang_code,
+            )
+        )
+
+        def _take(n: int) -> list[str]:
+            return [next(translated) for _ in range(n)]
+
+        (
+            narrative_t,
+            phase_weakness_t,
+            prep_priority_t,
+            risk_notes_t,
+            time_pressure_t,
+            rating_insight_t,
+            profile_t,
+            exploit_strategy_t,
+            color_insight_t,
+            fatigue_insight_t,
+        ) = _take(len(scalars))
+
+        result = {
+            "narrative": narrative_t,
             "plan": {
-                "focus_areas": _gt_list(plan.get("focus_areas") or [], lang_code),
-                "phase_weakness": _gt(plan.get("phase_weakness") or "", lang_code),
-                "prep_priority": _gt(plan.get("prep_priority") or "", lang_code),
-                "risk_notes": _gt(plan.get("risk_notes") or "", lang_code),
+                "focus_areas": _take(len(focus_areas)),
+                "phase_weakness": phase_weakness_t,
+                "prep_priority": prep_priority_t,
+                "risk_notes": risk_notes_t,
             },
             "scouting": {
-                "time_pressure_insight": _gt(scouting.get("time_pressure_insight") or "", lang_code),
-                "rating_insight": _gt(scouting.get("rating_insight") or "", lang_code),
-                "key_findings": _gt_list(scouting.get("key_findings") or [], lang_code),
+                "time_pressure_insight": time_pressure_t,
+                "rating_insight": rating_insight_t,
+                "key_findings": _take(len(key_findings)),
             },
             "pattern": {
-                "structural_tendencies": _gt_list(pattern.get("structural_tendencies") or [], lang_code),
-                "recurring_error_patterns": _gt_list(pattern.get("recurring_error_patterns") or [], lang_code),
-                "exploit_positions": _gt_list(pattern.get("exploit_positions") or [], lang_code),
+                "structural_tendencies": _take(len(structural)),
+                "recurring_error_patterns": _take(len(recurring)),
+                "exploit_positions": _take(len(exploit_positions)),
             },
             "psychology": {
-                "psychological_profile": _gt(psychology.get("psychological_profile") or "", lang_code),
-                "exploit_strategy": _gt(psychology.get("exploit_strategy") or "", lang_code),
-                "color_insight": _gt(psychology.get("color_insight") or "", lang_code),
-                "fatigue_insight": _gt(psychology.get("fatigue_insight") or "", lang_code),
+                "psychological_profile": profile_t,
+                "exploit_strategy": exploit_strategy_t,
+                "color_insight": color_insight_t,
+                "fatigue_insight": fatigue_insight_t,
             },
         }
+        if len(_translation_cache) >= _TRANSLATION_CACHE_MAX:
+            _translation_cache.clear()
+        _translation_cache[cache_key] = result
+        return result
     except Exception as exc:
         logger.exception("Translation failed for report %s", report_id)
         raise HTTPException(status_code=500, detail=str(exc))
 
 
+# Rendered chat context per report — the report content is immutable once
+# status == "ready", so the (large) system prompt only needs formatting once
+# per report instead of once per chat message.
+_chat_context_cache: dict[str, str] = {}
+_CHAT_CONTEXT_CACHE_MAX = 64
+
+
+def _chat_system_prompt(report: Report) -> str:
+    cached = _chat_context_cache.get(report.id)
+    if cached is not None:
+        return cached
+    content = report.content or {}
+    rendered = prompts.CHAT_CONTEXT.format(
+        plan=content.get("plan", {}),
+        scouting=content.get("scouting_report", {}),
+        patterns=content.get("pattern_report", {}),
+        psychology=content.get("psychology_report", {}),
+        narrative=content.get("narrative", ""),
+    )
+    if len(_chat_context_cache) >= _CHAT_CONTEXT_CACHE_MAX:
+        _chat_context_cache.clear()
+    _chat_context_cache[report.id] = rendered
+    return rendered
+
+
+# LLM replies keyed by prompt hash — asking the same question about the same
+# (immutable) report skips the multi-second model call entirely.
+_chat_reply_cache: dict[str, str] = {}
+_CHAT_REPLY_CACHE_MAX = 256
+
+
 @router.post("/{report_id}/chat")
-def chat_with_report(
+async def chat_with_report(
     opponent_id: str,
     report_id: str,
     req: ChatRequest,
@@ -352,29 +487,36 @@ def chat_with_report(
     """Ask a question about the report. Uses the report content as context."""
     from langchain_core.messages import HumanMessage, SystemMessage
 
+    from app.services.agent.graph import _get_chat_llm
+
     report = db.get(Report, report_id)
     if not report or report.opponent_space_id != opponent_id:
         raise HTTPException(status_code=404, detail="Report not found")
     if report.status != "ready":
         raise HTTPException(status_code=409, detail="Report is not ready yet")
 
-    content = report.content or {}
+    system_prompt = _chat_system_prompt(report)
 
-    system_prompt = prompts.CHAT_CONTEXT.format(
-        plan=content.get("plan", {}),
-        scouting=content.get("scouting_report", {}),
-        patterns=content.get("pattern_report", {}),
-        psychology=content.get("psychology_report", {}),
-        narrative=content.get("narrative", ""),
-    )
+    cache_key = hashlib.blake2b(
+        f"{system_prompt}\x00{req.message}".encode(), digest_size=16
+    ).hexdigest()
+    cached_reply = _chat_reply_cache.get(cache_key)
+    if cached_reply is not None:
+        return {"reply": cached_reply}
 
     try:
         llm = _get_chat_llm()
-        response = llm.invoke([
+        # ainvoke keeps the event loop free during the multi-second model
+        # call instead of pinning one of the sync-route worker threads.
+        response = await llm.ainvoke([
             SystemMessage(content=system_prompt),
             HumanMessage(content=req.message),
         ])
-        return {"reply": response.content.strip()}
+        reply = response.content.strip()
+        if len(_chat_reply_cache) >= _CHAT_REPLY_CACHE_MAX:
+            _chat_reply_cache.clear()
+        _chat_reply_cache[cache_key] = reply
+        return {"reply": reply}
     except Exception as exc:
         logger.exception("Chat failed for report %s", report_id)
         raise HTTPException(status_code=500, detail=str(exc))
@@ -10,6 +10,11 @@ class Settings(BaseModel):
     app_env: str = os.getenv("APP_ENV", "dev")
     database_url: str = os.getenv("DATABASE_URL", "sqlite:///./chess_prep.db")
     stockfish_path: str = os.getenv("STOCKFISH_PATH", "stockfish/stockfish_15_x64_avx2.exe")
+    engine_workers: int = int(os.getenv("ENGINE_WORKERS", "1"))
+    # Optional node budget per analysed position (0 = unlimited). Caps the
+    # cost of pathological searches so batch latency stays predictable when
+    # several engine workers share the CPU.
+    engine_nodes: int = int(os.getenv("ENGINE_NODES", "0"))
 
     # LLM provider: "anthropic" | "ollama"
     llm_provider: str = os.getenv("LLM_PROVIDER", "ollama")
@@ -91,7 +91,10 @@ class Game(Base):
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
     opponent_space_id: Mapped[str] = mapped_column(ForeignKey("opponent_spaces.id"), index=True)
-    source: Mapped[str] = mapped_column(String(50), index=True)
+    # No standalone index: the (source, source_game_id) unique constraint's
+    # index already serves source-prefixed lookups, and a second index would
+    # just add B-tree maintenance to every imported game.
+    source: Mapped[str] = mapped_column(String(50))
     source_game_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
 
     white_name: Mapped[str] = mapped_column(String(255))
@@ -3,11 +3,38 @@ from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
 
-engine_kwargs = {"future": True}
+# Report content and job payloads flow through JSON columns on every read and
+# write; orjson parses and serializes them several times faster than the
+# stdlib.  It is an optional speedup — fall back to json when not installed.
+try:
+    import orjson
+
+    def _json_dumps(value) -> str:  # type: ignore[no-untyped-def]
+        return orjson.dumps(value).decode()
+
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+
+    def _json_dumps(value) -> str:  # type: ignore[no-untyped-def]
+        # Compact separators: the stored JSON is machine-read only.
+        return json.dumps(value, separators=(",", ":"))
+
+    _json_loads = json.loads
+
+engine_kwargs = {
+    "future": True,
+    "json_serializer": _json_dumps,
+    "json_deserializer": _json_loads,
+}
 if settings.database_url.startswith("sqlite"):
     engine_kwargs["connect_args"] = {
         "timeout": 30,
         "check_same_thread": False,
+        # Pooled connections live a long time, so a larger prepared-statement
+        # cache keeps every recurring query (imports, analytics, polling)
+        # compiled across requests instead of re-parsing SQL text.
+        "cached_statements": 256,
     }
 
 engine = create_engine(settings.database_url, **engine_kwargs)
@@ -19,6 +46,15 @@ if settings.database_url.startswith("sqlite"):
         cursor = dbapi_connection.cursor()
         cursor.execute("PRAGMA journal_mode=WAL")
         cursor.execute("PRAGMA busy_timeout=30000")
+        # WAL already guarantees consistency on application crash; NORMAL
+        # skips the per-commit fsync of the WAL file, which dominates the
+        # small-commit latency of import and analysis jobs.
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        # Negative cache_size is KiB: ~16MB page cache per connection.
+        cursor.execute("PRAGMA cache_size=-16000")
+        # Read pages via mmap (256MB window) instead of read() syscalls.
+        cursor.execute("PRAGMA mmap_size=268435456")
         cursor.close()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, future=True, bind=engine)
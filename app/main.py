@@ -18,6 +18,13 @@ from fastapi.middleware.cors import CORSMiddleware
 
 def create_app() -> FastAPI:
     app = FastAPI(title="Chess Preparation Agent")
+
+    # Page the coach models into Ollama's memory ahead of the first report
+    @app.on_event("startup")
+    def _warm_llm() -> None:
+        from app.services.agent.graph import warm_ollama_models
+        warm_ollama_models()
+
     app.include_router(health_router)
     app.include_router(opponents_router)
     app.include_router(imports_router)
@@ -42,7 +49,10 @@ with engine.connect() as _conn:
         _conn.execute(text("ALTER TABLE opponent_spaces ADD COLUMN profile_data JSON"))
         _conn.commit()
 
-    # games
+    # games — drop the old standalone source index; the (source,
+    # source_game_id) unique index covers source-prefixed lookups
+    _conn.execute(text("DROP INDEX IF EXISTS ix_games_source"))
+    _conn.commit()
     _cols = {c["name"] for c in _insp.get_columns("games")}
     for _col, _ddl in [
         ("white_rating", "INTEGER"),
@@ -14,6 +14,7 @@ from __future__ import annotations
 
 import json
 import logging
+from functools import lru_cache
 from typing import Any, TypedDict
 
 from langchain_core.language_models import BaseChatModel
@@ -54,7 +55,11 @@ class PrepState(TypedDict, total=False):
 # LLM factory — switches between Anthropic and Ollama via LLM_PROVIDER env
 # ---------------------------------------------------------------------------
 
+@lru_cache(maxsize=8)
 def _make_llm(model: str, ollama_model: str, temperature: float = 0.3) -> BaseChatModel:
+    # Cached per (model, ollama_model, temperature): client construction sets
+    # up HTTP sessions and re-reads config, and every graph node was paying
+    # for a fresh client per invocation.
     if settings.llm_provider == "anthropic":
         from langchain_anthropic import ChatAnthropic
         return ChatAnthropic(
@@ -71,6 +76,43 @@ def _make_llm(model: str, ollama_model: str, temperature: float = 0.3) -> BaseCh
     )
 
 
+def warm_ollama_models() -> None:
+    """Preload the configured Ollama models in the background.
+
+    The first request to a cold Ollama model pays the full load penalty
+    (several seconds of paging an 8B model into memory).  An empty generate
+    call with a keep_alive warms each configured model at server start and
+    keeps it resident between report runs.  No-op for other providers, and
+    silent when the Ollama server is unreachable.
+    """
+    if settings.llm_provider != "ollama":
+        return
+    import threading
+    import urllib.request
+
+    models = {
+        settings.ollama_chat_model,
+        settings.ollama_tagger_model,
+        settings.ollama_report_model,
+    }
+
+    def _warm() -> None:
+        for model in models:
+            try:
+                req = urllib.request.Request(
+                    f"{settings.ollama_base_url}/api/generate",
+                    data=json.dumps(
+                        {"model": model, "prompt": "", "keep_alive": "30m"}
+                    ).encode(),
+                    headers={"Content-Type": "application/json"},
+                )
+                urllib.request.urlopen(req, timeout=120).close()
+            except Exception:
+                logger.info("Ollama warm-up skipped for %s", model)
+
+    threading.Thread(target=_warm, daemon=True, name="ollama-warmup").start()
+
+
 def _get_chat_llm() -> BaseChatModel:
     return _make_llm(settings.chat_model, settings.ollama_chat_model, temperature=0.2)
 
@@ -311,24 +353,35 @@ def synthesis_node(state: PrepState) -> dict:
     psychology = state.get("psychology_report", {})
 
     opening_stats = (state.get("pattern_data") or {}).get("opening_stats", [])
+    # List comprehensions (not genexprs) inside join: str.join sizes its
+    # result from the list in one pass instead of growing incrementally.
     openings_md = "\n".join(
-        f"- **{o.get('opening_name') or o.get('eco', '?')}** "
-        f"({o.get('color', '?')}) — {o.get('games_count', 0)} games, "
-        f"{o.get('win_pct', 0)}% wins"
-        for o in opening_stats[:6]
+        [
+            f"- **{o.get('opening_name') or o.get('eco', '?')}** "
+            f"({o.get('color', '?')}) — {o.get('games_count', 0)} games, "
+            f"{o.get('win_pct', 0)}% wins"
+            for o in opening_stats[:6]
+        ]
     )
 
     tree_md = "\n".join(
-        f"- **{t.get('eco', '?')} {t.get('opening_name', '')}** "
-        f"[{t.get('action', '').replace('_', ' ')}] — {t.get('reason', '')}"
-        for t in opening_tree
+        [
+            f"- **{t.get('eco', '?')} {t.get('opening_name', '')}** "
+            f"[{t.get('action', '').replace('_', ' ')}] — {t.get('reason', '')}"
+            for t in opening_tree
+        ]
     ) if opening_tree else "—"
 
+    # Bind the joined fragments first so the final f-string is a single
+    # concatenation of prebuilt strings rather than formatting work inline.
+    focus_md = ", ".join(plan.get("focus_areas", []))
+    targets_md = ", ".join(plan.get("target_openings", []))
+
     report_markdown = f"""# Preparation Report
 
 ## Strategy Plan
-- **Focus areas:** {', '.join(plan.get('focus_areas', []))}
-- **Target openings:** {', '.join(plan.get('target_openings', []))}
+- **Focus areas:** {focus_md}
+- **Target openings:** {targets_md}
 - **Phase weakness:** {plan.get('phase_weakness', '—')}
 - **Prep priority:** {plan.get('prep_priority', '—')}
 
@@ -366,7 +419,11 @@ def synthesis_node(state: PrepState) -> dict:
 # Graph assembly
 # ---------------------------------------------------------------------------
 
+@lru_cache(maxsize=1)
 def build_prep_graph() -> StateGraph:
+    # The node set is static, so compilation is a pure function — cache it so
+    # direct callers share the module-level `prep_graph` (and its MemorySaver)
+    # instead of re-registering nodes and re-compiling per call.
     g = StateGraph(PrepState)
 
     g.add_node("orchestrator", orchestrator_node)
@@ -1,9 +1,24 @@
+# Prompt layout convention: static instructions and output schemas come first,
+# per-opponent data last.  LLM backends that cache prompt prefixes (Anthropic
+# prompt caching, llama.cpp/Ollama prompt cache) can then reuse the prefill of
+# the unchanging instruction block across opponents and runs.
+
 ORCHESTRATOR_SYSTEM = """You are an expert chess preparation analyst.
 Given an opponent's profile and opening statistics, produce a focused preparation
 strategy plan as a JSON object. Be specific, data-driven, and actionable.
 Output ONLY valid JSON — no prose, no markdown fences."""
 
 ORCHESTRATOR_PROMPT = """
+Produce a JSON strategy plan for the opponent described below, with these exact keys:
+{{
+  "focus_areas": ["<2-3 specific tactical or strategic areas to target>"],
+  "target_openings": ["<ECO or opening name where opponent is weakest — low win%, high blunder_rate>"],
+  "avoid_openings": ["<ECO or opening name where opponent is strongest>"],
+  "phase_weakness": "<opening|middlegame|endgame — infer from blunder_rate and avg_cpl patterns>",
+  "risk_notes": "<1-2 sentences on how the risk mode shapes the approach>",
+  "prep_priority": "<attack|positional|endgame>"
+}}
+
 Opponent: {name}
 Title: {title}
 Standard rating: {rating}
@@ -12,16 +27,6 @@ Risk mode: {risk_mode}
 
 Top opening buckets (sorted by games played):
 {openings}
-
-Produce a JSON strategy plan with these exact keys:
-{{
-  "focus_areas": ["<2-3 specific tactical or strategic areas to target>"],
-  "target_openings": ["<ECO or opening name where opponent is weakest — low win%, high blunder_rate>"],
-  "avoid_openings": ["<ECO or opening name where opponent is strongest>"],
-  "phase_weakness": "<opening|middlegame|endgame — infer from blunder_rate and avg_cpl patterns>",
-  "risk_notes": "<1-2 sentences on how {risk_mode} shapes the approach>",
-  "prep_priority": "<attack|positional|endgame>"
-}}
 """
 
 # ---------------------------------------------------------------------------
@@ -34,7 +39,16 @@ time controls, rating brackets, and clock pressure situations.
 Output ONLY valid JSON — no prose, no markdown fences."""
 
 SCOUTING_PROMPT = """
-Game distribution data for opponent:
+Produce a JSON scouting report from the game distribution data below:
+{{
+  "preferred_time_control": "<bullet|blitz|rapid|classical — where they play most/perform best>",
+  "time_pressure_sensitivity": "<high|medium|low>",
+  "time_pressure_insight": "<1-2 sentences on how clock pressure affects them>",
+  "strongest_bracket": "<rating bracket where they perform best>",
+  "weakest_bracket": "<rating bracket where they perform worst>",
+  "rating_insight": "<1-2 sentences on performance vs different rating levels>",
+  "key_findings": ["<finding 1>", "<finding 2>", "<finding 3>"]
+}}
 
 Time control breakdown:
 {time_control_breakdown}
@@ -51,17 +65,6 @@ Sample time-pressure collapses (worst blunders under 30s):
 {time_pressure_sample}
 
 Total games: {total_games}
-
-Produce a JSON scouting report:
-{{
-  "preferred_time_control": "<bullet|blitz|rapid|classical — where they play most/perform best>",
-  "time_pressure_sensitivity": "<high|medium|low>",
-  "time_pressure_insight": "<1-2 sentences on how clock pressure affects them>",
-  "strongest_bracket": "<rating bracket where they perform best>",
-  "weakest_bracket": "<rating bracket where they perform worst>",
-  "rating_insight": "<1-2 sentences on performance vs different rating levels>",
-  "key_findings": ["<finding 1>", "<finding 2>", "<finding 3>"]
-}}
 """
 
 # ---------------------------------------------------------------------------
@@ -74,6 +77,16 @@ and phase-specific error tendencies.
 Output ONLY valid JSON — no prose, no markdown fences."""
 
 PATTERN_PROMPT = """
+Produce a JSON pattern report from the repertoire data below:
+{{
+  "structural_tendencies": ["<2-3 recurring pawn or piece placement habits>"],
+  "book_deviation_habit": "<when and how they typically leave opening theory>",
+  "dominant_phase_weakness": "<opening|middlegame|endgame — the phase with most/worst errors>",
+  "recurring_error_patterns": ["<error pattern 1>", "<error pattern 2>"],
+  "exploit_positions": ["<type of position or structure that provokes their errors>"],
+  "opening_depth_assessment": "<shallow|moderate|deep — how well they know their openings>"
+}}
+
 Opening repertoire (opponent's most played openings):
 {opening_stats}
 
@@ -85,16 +98,6 @@ Error distribution by game phase:
 
 Critical positions (highest centipawn-loss blunders with context):
 {critical_positions}
-
-Produce a JSON pattern report:
-{{
-  "structural_tendencies": ["<2-3 recurring pawn or piece placement habits>"],
-  "book_deviation_habit": "<when and how they typically leave opening theory>",
-  "dominant_phase_weakness": "<opening|middlegame|endgame — the phase with most/worst errors>",
-  "recurring_error_patterns": ["<error pattern 1>", "<error pattern 2>"],
-  "exploit_positions": ["<type of position or structure that provokes their errors>"],
-  "opening_depth_assessment": "<shallow|moderate|deep — how well they know their openings>"
-}}
 """
 
 # ---------------------------------------------------------------------------
@@ -106,6 +109,19 @@ psychological comfort zones, and exploit points based on performance data.
 Output ONLY valid JSON — no prose, no markdown fences."""
 
 PSYCHOLOGY_PROMPT = """
+Produce a JSON psychology report from the behavioral data below:
+{{
+  "color_preference": "<white|black|neutral — which color they clearly perform better with>",
+  "color_insight": "<1-2 sentences on the color performance gap and what it means>",
+  "psychological_profile": "<1-2 sentences characterizing their playing style and mental tendencies>",
+  "comfort_zone_openings": ["<eco/name>"],
+  "discomfort_zone_openings": ["<eco/name>"],
+  "critical_move_range": "<move range like '15-25' where their blunder rate peaks>",
+  "fatigue_pattern": "<none|early|late|null — if round data available, when they fade; null if no data>",
+  "fatigue_insight": "<1 sentence on round fatigue if data available, else null>",
+  "exploit_strategy": "<1-2 sentences on the best psychological approach given this profile>"
+}}
+
 Color performance (as white vs as black):
 {color_stats}
 
@@ -123,19 +139,6 @@ Round fatigue — blunder rate by tournament round bucket (null if no round data
 
 Win rate by round bucket:
 {win_by_round}
-
-Produce a JSON psychology report:
-{{
-  "color_preference": "<white|black|neutral — which color they clearly perform better with>",
-  "color_insight": "<1-2 sentences on the color performance gap and what it means>",
-  "psychological_profile": "<1-2 sentences characterizing their playing style and mental tendencies>",
-  "comfort_zone_openings": ["<eco/name>"],
-  "discomfort_zone_openings": ["<eco/name>"],
-  "critical_move_range": "<move range like '15-25' where their blunder rate peaks>",
-  "fatigue_pattern": "<none|early|late|null — if round data available, when they fade; null if no data>",
-  "fatigue_insight": "<1 sentence on round fatigue if data available, else null>",
-  "exploit_strategy": "<1-2 sentences on the best psychological approach given this profile>"
-}}
 """
 
 # ---------------------------------------------------------------------------
@@ -153,21 +156,8 @@ Risk modes:
 """
 
 SYNTHESIS_PROMPT = """
-Risk mode: {risk_mode}
-
-Strategy plan (approved by user):
-{plan}
-
-Scouting report (time control & pressure analysis):
-{scouting_report}
-
-Pattern report (structural & positional tendencies):
-{pattern_report}
-
-Psychology report (behavioral & comfort zone analysis):
-{psychology_report}
-
-Write a preparation strategy narrative (500-700 words) covering:
+Write a preparation strategy narrative (500-700 words) from the approved plan
+and agent reports below, covering:
 
 1. **Opening approach** — which openings to steer toward and why (cite ECO codes).
    Reference where the opponent deviates from theory and their comfort/discomfort zones.
@@ -177,7 +167,7 @@ Write a preparation strategy narrative (500-700 words) covering:
    Cite specific move-number ranges where blunders peak.
 4. **Psychological angle** — how their color preference and comfort zone tendencies
    should shape your opening selection and overall game plan.
-5. **Concrete recommendation** — one specific practical piece of advice matching {risk_mode}.
+5. **Concrete recommendation** — one specific practical piece of advice matching the risk mode.
 6. **What to avoid** — openings or structures where the opponent performs well.
 
 After the narrative, output a separator line: ---OPENING_TREE---
@@ -202,6 +192,20 @@ Children are optional — only add them if you have specific variation-level ins
     ]
   }}
 ]
+
+Risk mode: {risk_mode}
+
+Strategy plan (approved by user):
+{plan}
+
+Scouting report (time control & pressure analysis):
+{scouting_report}
+
+Pattern report (structural & positional tendencies):
+{pattern_report}
+
+Psychology report (behavioral & comfort zone analysis):
+{psychology_report}
 """
 
 CHAT_CONTEXT = """You are a chess prep assistant. Answer questions about the opponent
@@ -5,6 +5,8 @@ graph nodes stay decoupled from ORM models.
 """
 from __future__ import annotations
 
+from functools import lru_cache
+
 from sqlalchemy import case, func, select
 from sqlalchemy.orm import Session
 
@@ -21,8 +23,14 @@ from app.db.models import (
 # Helpers
 # ---------------------------------------------------------------------------
 
+@lru_cache(maxsize=256)
 def _classify_tc(tc: str | None) -> str:
-    """Map a PGN time-control string to a human category."""
+    """Map a PGN time-control string to a human category.
+
+    Memoized: an opponent's games reuse a handful of distinct time-control
+    strings, so classification is parsed once per distinct value rather
+    than once per game.
+    """
     if not tc:
         return "unknown"
     try:
@@ -119,21 +127,10 @@ def get_scouting_data(db: Session, space_id: str) -> dict:
         db.scalars(select(Game).where(Game.opponent_space_id == space_id)).all()
     )
 
-    # --- Time control breakdown ---
+    # --- Time control and rating bracket breakdowns, one pass over games ---
+    # The two accumulations shared nothing but the games (and the per-game
+    # side/outcome derivation), so they were walking the same rows twice.
     tc_stats: dict[str, dict] = {}
-    for g in games:
-        cat = _classify_tc(g.time_control)
-        if cat not in tc_stats:
-            tc_stats[cat] = {"games": 0, "wins": 0, "draws": 0, "losses": 0}
-        tc_stats[cat]["games"] += 1
-        outcome = _result_for_side(g.result, g.opponent_side.value if g.opponent_side else None)
-        _increment(tc_stats[cat], outcome)
-
-    for cat, s in tc_stats.items():
-        n = s["games"]
-        s["win_pct"] = round(s["wins"] / n * 100) if n else 0
-
-    # --- Rating bracket breakdown ---
     brackets = {
         "<1500": {"games": 0, "wins": 0, "losses": 0, "draws": 0},
         "1500-1800": {"games": 0, "wins": 0, "losses": 0, "draws": 0},
@@ -142,22 +139,32 @@ def get_scouting_data(db: Session, space_id: str) -> dict:
     }
     for g in games:
         side = g.opponent_side.value if g.opponent_side else None
-        opp_rating = g.white_rating if side == "white" else g.black_rating
-        if not opp_rating:
-            continue
-        if opp_rating < 1500:
-            bk = "<1500"
-        elif opp_rating < 1800:
-            bk = "1500-1800"
-        elif opp_rating < 2100:
-            bk = "1800-2100"
-        else:
-            bk = "2100+"
-        brackets[bk]["games"] += 1
         outcome = _result_for_side(g.result, side)
-        _increment(brackets[bk], outcome)
 
-    for bk, s in brackets.items():
+        cat = _classify_tc(g.time_control)
+        if cat not in tc_stats:
+            tc_stats[cat] = {"games": 0, "wins": 0, "draws": 0, "losses": 0}
+        tc_stats[cat]["games"] += 1
+        _increment(tc_stats[cat], outcome)
+
+        opp_rating = g.white_rating if side == "white" else g.black_rating
+        if opp_rating:
+            if opp_rating < 1500:
+                bk = "<1500"
+            elif opp_rating < 1800:
+                bk = "1500-1800"
+            elif opp_rating < 2100:
+                bk = "1800-2100"
+            else:
+                bk = "2100+"
+            brackets[bk]["games"] += 1
+            _increment(brackets[bk], outcome)
+
+    for s in tc_stats.values():
+        n = s["games"]
+        s["win_pct"] = round(s["wins"] / n * 100) if n else 0
+
+    for s in brackets.values():
         n = s["games"]
         s["win_pct"] = round(s["wins"] / n * 100) if n else 0
 
@@ -189,47 +196,36 @@ def get_scouting_data(db: Session, space_id: str) -> dict:
         .limit(15)
     ).all()
 
-    # Total blunder counts under pressure vs normal (for ratio)
-    def _blunder_count(under_pressure: bool) -> int:
-        q = (
-            select(func.count(EngineAnalysis.id))
-            .join(Game, Game.id == EngineAnalysis.game_id)
-            .join(
-                MoveFact,
-                (MoveFact.game_id == EngineAnalysis.game_id)
-                & (MoveFact.ply == EngineAnalysis.ply),
-            )
-            .where(Game.opponent_space_id == space_id)
-            .where(EngineAnalysis.classification.in_(["blunder", "mistake"]))
-            .where(MoveFact.side_to_move == Game.opponent_side)
-            .where(MoveFact.clock_after_ms.isnot(None))
-        )
-        if under_pressure:
-            q = q.where(MoveFact.clock_after_ms < TIME_THRESHOLD_MS)
-        else:
-            q = q.where(MoveFact.clock_after_ms >= TIME_THRESHOLD_MS)
-        return db.scalar(q) or 0
-
-    pressure_count = _blunder_count(True)
-    normal_count = _blunder_count(False)
-
-    # Total move counts for rate calculation
-    def _move_count(under_pressure: bool) -> int:
-        q = (
-            select(func.count(MoveFact.id))
-            .join(Game, Game.id == MoveFact.game_id)
-            .where(Game.opponent_space_id == space_id)
-            .where(MoveFact.side_to_move == Game.opponent_side)
-            .where(MoveFact.clock_after_ms.isnot(None))
+    # Pressure vs normal counts in one conditional aggregation each — the
+    # old pressure/normal query pairs scanned the same join twice per metric
+    # (four passes total) just to split rows on the clock threshold.
+    _pressure_flag = case((MoveFact.clock_after_ms < TIME_THRESHOLD_MS, 1), else_=0)
+
+    blunder_totals = db.execute(
+        select(func.sum(_pressure_flag), func.count(EngineAnalysis.id))
+        .join(Game, Game.id == EngineAnalysis.game_id)
+        .join(
+            MoveFact,
+            (MoveFact.game_id == EngineAnalysis.game_id)
+            & (MoveFact.ply == EngineAnalysis.ply),
         )
-        if under_pressure:
-            q = q.where(MoveFact.clock_after_ms < TIME_THRESHOLD_MS)
-        else:
-            q = q.where(MoveFact.clock_after_ms >= TIME_THRESHOLD_MS)
-        return db.scalar(q) or 1  # avoid div-by-zero
+        .where(Game.opponent_space_id == space_id)
+        .where(EngineAnalysis.classification.in_(["blunder", "mistake"]))
+        .where(MoveFact.side_to_move == Game.opponent_side)
+        .where(MoveFact.clock_after_ms.isnot(None))
+    ).one()
+    pressure_count = blunder_totals[0] or 0
+    normal_count = (blunder_totals[1] or 0) - pressure_count
 
-    pressure_moves = _move_count(True)
-    normal_moves = _move_count(False)
+    move_totals = db.execute(
+        select(func.sum(_pressure_flag), func.count(MoveFact.id))
+        .join(Game, Game.id == MoveFact.game_id)
+        .where(Game.opponent_space_id == space_id)
+        .where(MoveFact.side_to_move == Game.opponent_side)
+        .where(MoveFact.clock_after_ms.isnot(None))
+    ).one()
+    pressure_moves = move_totals[0] or 0
+    normal_moves = (move_totals[1] or 0) - pressure_moves
 
     pressure_rate = round(pressure_count / pressure_moves * 100, 1) if pressure_moves else 0
     normal_rate = round(normal_count / normal_moves * 100, 1) if normal_moves else 0
@@ -379,26 +375,38 @@ def get_pattern_data(db: Session, space_id: str) -> dict:
             | (EngineAnalysis.best_move_san != MoveFact.san)
         )
         .order_by(EngineAnalysis.centipawn_loss.desc())
-        .limit(6)
+        # Over-fetch: the same trap position can recur across games, and
+        # duplicates are collapsed below before taking the top 6.
+        .limit(24)
     ).all()
 
-    critical_positions = [
-        {
-            "game_id": str(r.game_id),
-            "ply": r.ply,
-            "phase": r.phase.value if r.phase else None,
-            "fen_before": r.fen_before,
-            "move_san": r.san,
-            "best_move_san": r.best_move_san,
-            "best_move_uci": r.best_move_uci,
-            "eval_before_cp": r.eval_before_cp,
-            "eval_after_cp": r.eval_after_cp,
-            "centipawn_loss": r.centipawn_loss,
-            "eco": r.eco,
-            "opening_name": r.opening_name,
-        }
-        for r in crit_rows
-    ]
+    # Dedupe by position (FEN minus move counters).  Rows arrive sorted by
+    # CPL, so first-seen keeps the worst instance of each position.
+    seen_positions: set[str] = set()
+    critical_positions: list[dict] = []
+    for r in crit_rows:
+        pos_key = r.fen_before.rsplit(" ", 2)[0]
+        if pos_key in seen_positions:
+            continue
+        seen_positions.add(pos_key)
+        critical_positions.append(
+            {
+                "game_id": str(r.game_id),
+                "ply": r.ply,
+                "phase": r.phase.value if r.phase else None,
+                "fen_before": r.fen_before,
+                "move_san": r.san,
+                "best_move_san": r.best_move_san,
+                "best_move_uci": r.best_move_uci,
+                "eval_before_cp": r.eval_before_cp,
+                "eval_after_cp": r.eval_after_cp,
+                "centipawn_loss": r.centipawn_loss,
+                "eco": r.eco,
+                "opening_name": r.opening_name,
+            }
+        )
+        if len(critical_positions) == 6:
+            break
 
     return {
         "opening_stats": opening_stats,
@@ -1,17 +1,27 @@
 from __future__ import annotations
 
 import logging
-from collections import defaultdict
 from datetime import date
-from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import Session
 
 from app.db.models import EngineAnalysis, Game, OpeningStat
 
 logger = logging.getLogger(__name__)
 
+# (result, opponent side) → W/D/L bucket, seen from the opponent's side.
+# A single dict probe per game instead of a chain of string comparisons;
+# unknown results ("*", aborted games) fall through to no bucket.
+_OUTCOME_BUCKET = {
+    ("1-0", "white"): "wins",
+    ("1-0", "black"): "losses",
+    ("0-1", "black"): "wins",
+    ("0-1", "white"): "losses",
+    ("1/2-1/2", "white"): "draws",
+    ("1/2-1/2", "black"): "draws",
+}
+
 
 class OpeningStatsService:
     # ------------------------------------------------------------------
@@ -20,14 +30,22 @@ class OpeningStatsService:
 
     def _compute(self, db: Session, opponent_id: str) -> list[dict]:
         """Aggregate opening stats from the games and engine_analyses tables."""
-        games = list(
-            db.scalars(
-                select(Game)
-                .where(Game.opponent_space_id == opponent_id)
-                .where(Game.opponent_side.is_not(None))
-                .order_by(Game.date_played.desc().nullslast(), Game.created_at.desc())
-            ).all()
-        )
+        # Column select, not full Game entities: the loop below only reads a
+        # fixed handful of fields, and plain Row tuples skip the identity-map
+        # bookkeeping and instrumented attribute access of ORM instances.
+        games = db.execute(
+            select(
+                Game.id,
+                Game.opening_name,
+                Game.eco,
+                Game.opponent_side,
+                Game.result,
+                Game.date_played,
+            )
+            .where(Game.opponent_space_id == opponent_id)
+            .where(Game.opponent_side.is_not(None))
+            .order_by(Game.date_played.desc().nullslast(), Game.created_at.desc())
+        ).all()
 
         buckets: dict[tuple, dict] = {}
 
@@ -55,47 +73,55 @@ class OpeningStatsService:
             ):
                 bucket["last_seen"] = game.date_played
 
-            if game.result == "1/2-1/2":
-                bucket["draws"] += 1
-            elif game.result == "1-0":
-                if game.opponent_side.value == "white":
-                    bucket["wins"] += 1
-                else:
-                    bucket["losses"] += 1
-            elif game.result == "0-1":
-                if game.opponent_side.value == "black":
-                    bucket["wins"] += 1
-                else:
-                    bucket["losses"] += 1
-
-        # Pull engine analysis for CPL and blunder rate
+            outcome = _OUTCOME_BUCKET.get((game.result, game.opponent_side.value))
+            if outcome:
+                bucket[outcome] += 1
+
+        # Pull engine analysis for CPL and blunder rate, pre-aggregated per
+        # game with a single GROUP BY — the reduction runs inside SQLite
+        # instead of streaming every analysis row through Python.
         game_ids = [g.id for g in games]
-        cpl_map: dict[str, list[int]] = defaultdict(list)
-        blunder_map: dict[str, int] = defaultdict(int)
-        move_count_map: dict[str, int] = defaultdict(int)
+        cpl_map: dict[str, tuple[float, int]] = {}  # (sum, count)
+        blunder_map: dict[str, int] = {}
+        move_count_map: dict[str, int] = {}
 
         if game_ids:
-            for analysis in db.scalars(
-                select(EngineAnalysis).where(EngineAnalysis.game_id.in_(game_ids))
-            ).all():
-                if analysis.centipawn_loss is not None:
-                    cpl_map[analysis.game_id].append(analysis.centipawn_loss)
-                move_count_map[analysis.game_id] += 1
-                if analysis.classification and analysis.classification.value == "blunder":
-                    blunder_map[analysis.game_id] += 1
+            rows = db.execute(
+                select(
+                    EngineAnalysis.game_id,
+                    func.count(EngineAnalysis.id),
+                    func.sum(EngineAnalysis.centipawn_loss),
+                    func.count(EngineAnalysis.centipawn_loss),
+                    func.sum(
+                        case((EngineAnalysis.classification == "blunder", 1), else_=0)
+                    ),
+                )
+                .where(EngineAnalysis.game_id.in_(game_ids))
+                .group_by(EngineAnalysis.game_id)
+            ).all()
+            for gid, n_moves, cpl_sum, cpl_n, n_blunders in rows:
+                move_count_map[gid] = n_moves
+                blunder_map[gid] = n_blunders or 0
+                if cpl_n:
+                    cpl_map[gid] = (cpl_sum, cpl_n)
 
         results = []
         for bucket in buckets.values():
-            avg_cpls: list[float] = []
+            # Running sum/count instead of materializing a per-bucket list of
+            # per-game averages just to re-reduce it.
+            cpl_total = 0.0
+            games_with_cpl = 0
             total_blunders = 0
             total_analyzed_moves = 0
             for gid in bucket["_game_ids"]:
-                if cpl_map.get(gid):
-                    avg_cpls.append(sum(cpl_map[gid]) / len(cpl_map[gid]))
+                acc = cpl_map.get(gid)
+                if acc and acc[1]:
+                    cpl_total += acc[0] / acc[1]
+                    games_with_cpl += 1
                 total_blunders += blunder_map.get(gid, 0)
                 total_analyzed_moves += move_count_map.get(gid, 0)
 
-            avg_cpl = sum(avg_cpls) / len(avg_cpls) if avg_cpls else None
+            avg_cpl = cpl_total / games_with_cpl if games_with_cpl else None
             blunder_rate = (
                 total_blunders / total_analyzed_moves if total_analyzed_moves else 0.0
             )
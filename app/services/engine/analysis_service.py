@@ -1,35 +1,79 @@
 import logging
-from typing import Optional
+from typing import Callable, Optional, Sequence
 
 import chess
-from sqlalchemy import select
+from sqlalchemy import Row, insert, select
 from sqlalchemy.orm import Session
 
-from app.db.models import EngineAnalysis, Game, Job, MoveFact
+from app.db.models import EngineAnalysis, Game, Job, MoveClassification, MoveFact
 from app.services.engine.classifier import classify_by_cpl
 from app.services.engine.stockfish_client import StockfishClient
+from app.services.parsing.opening_book import lookup_opening
 
 logger = logging.getLogger(__name__)
 
+# Two-pass analysis: every position gets a cheap shallow look first, and only
+# plies whose shallow loss approaches the 20cp "good" classification boundary
+# are re-analyzed at the caller's full depth.
+_SHALLOW_DEPTH = 6
+_DEEP_PASS_CPL = 14
+
 
 def _eval_loss_for_side(side: str, played_eval_cp: Optional[int], best_eval_cp: Optional[int]) -> int:
     """Return CPL from the moving side's perspective.
 
     Engine scores are stored from White's perspective, so we compare the
-    position after the played move against the position after the engine's
-    best move, then flip the sign for Black.
+    position after the played move against the evaluation before the move
+    (which already assumes best play), then flip the sign for Black.
     """
-    played = played_eval_cp or 0
-    best = best_eval_cp or 0
+    sign = 1 if side == "white" else -1
+    return max(0, ((best_eval_cp or 0) - (played_eval_cp or 0)) * sign)
+
+
+def _prefilter_plies(moves: Sequence[Row]) -> dict[int, str]:
+    """Return {ply: reason} for plies that can be classified without the engine.
+
+    Two cheap heuristics:
+      - "book":   the position after the move is still in the ECO opening
+                  book, so the move is a known theory line, not a blunder.
+      - "forced": there was only one legal move, so no alternative existed.
+
+    Such plies get a best/0-CPL analysis row without any Stockfish call.
 
-    if side == "white":
-        return max(0, best - played)
-    return max(0, played - best)
+    Replays the game incrementally on a single board — FEN parsing is a known
+    python-chess hot spot, so the per-ply ``chess.Board(fen)`` constructions
+    are avoided entirely.
+    """
+    skip: dict[int, str] = {}
+    if not moves:
+        return skip
+    try:
+        board = chess.Board(moves[0].fen_before)
+    except ValueError:
+        return skip
+
+    for move in moves:
+        forced = board.legal_moves.count() == 1
+        try:
+            board.push_uci(move.uci)
+        except ValueError:
+            board = chess.Board(move.fen_after)
+        if move.is_book and lookup_opening(board.epd()):
+            skip[move.ply] = "book"
+        elif forced:
+            skip[move.ply] = "forced"
+    return skip
+
+
+# Shared across AnalysisService instances (and therefore across background
+# jobs): engine processes stay warm — no subprocess spawn + UCI handshake per
+# run — and the in-memory FEN cache accumulates across opponents.
+_shared_stockfish_client = StockfishClient()
 
 
 class AnalysisService:
     def __init__(self, stockfish_client: StockfishClient | None = None):
-        self.stockfish_client = stockfish_client or StockfishClient()
+        self.stockfish_client = stockfish_client or _shared_stockfish_client
 
     # ------------------------------------------------------------------
     # Internal helpers
@@ -51,15 +95,21 @@ class AnalysisService:
                 EngineAnalysis.best_move_uci,
                 EngineAnalysis.principal_variation,
                 EngineAnalysis.depth,
-            ).where(EngineAnalysis.depth >= depth)
+            ).where(
+                EngineAnalysis.depth >= depth,
+                # Book/forced plies are stored without an eval; seeding those
+                # would make shared opening positions look like score 0.
+                EngineAnalysis.eval_before_cp.is_not(None),
+            )
         ).all()
 
         seeded = 0
+        cache = self.stockfish_client._cache  # bound once — probed per row below
         for row in rows:
-            key = (row.fen_before, depth)
-            if key not in self.stockfish_client._cache:
+            key = StockfishClient._key(row.fen_before, depth)
+            if key not in cache:
                 pv = (row.principal_variation or {}).get("pv", [])
-                self.stockfish_client._cache[key] = {
+                cache[key] = {
                     "score_cp": row.eval_before_cp,
                     "best_move_uci": row.best_move_uci,
                     "pv": pv,
@@ -79,6 +129,7 @@ class AnalysisService:
         game_id: str,
         depth: int = 12,
         max_plies: Optional[int] = None,
+        progress_cb: Optional[Callable[[int, int], None]] = None,
     ) -> int:
         """Analyze every move in *game_id* and (re-)write EngineAnalysis rows.
 
@@ -90,69 +141,171 @@ class AnalysisService:
         if not game:
             raise ValueError(f"Game {game_id} not found")
 
-        moves = list(
-            db.scalars(
-                select(MoveFact)
-                .where(MoveFact.game_id == game_id)
-                .order_by(MoveFact.ply.asc())
-            ).all()
-        )
+        # Explicit column list instead of SELECT * into ORM entities — the
+        # analysis loops read six fixed fields per ply, and Row tuples skip
+        # the per-row hydration and instrumented attribute access.
+        moves = db.execute(
+            select(
+                MoveFact.ply,
+                MoveFact.uci,
+                MoveFact.fen_before,
+                MoveFact.fen_after,
+                MoveFact.side_to_move,
+                MoveFact.is_book,
+            )
+            .where(MoveFact.game_id == game_id)
+            .order_by(MoveFact.ply.asc())
+        ).all()
 
         if max_plies is not None:
             moves = moves[:max_plies]
 
         # Drop stale analysis rows for this game before writing fresh ones
-        db.execute(
-            select(EngineAnalysis).where(EngineAnalysis.game_id == game_id)
-        )
         db.query(EngineAnalysis).filter(EngineAnalysis.game_id == game_id).delete()
         db.flush()
 
+        skip_plies = _prefilter_plies(moves)
+
+        # The client is dereferenced several times per ply below — bind it to
+        # a local once instead of re-walking the attribute chain in the loops.
+        client = self.stockfish_client
+
+        # Warm the cache in one batch so the engine pool (ENGINE_WORKERS > 1)
+        # can evaluate positions in parallel; the loop below then reads from
+        # the cache.  fen_after of ply N is fen_before of ply N+1, so only the
+        # final fen_after adds a new position.  Pre-filtered plies contribute
+        # no positions of their own.
+        shallow_depth = min(_SHALLOW_DEPTH, depth)
+        fens: list[str] = []
+        for move in moves:
+            if move.ply in skip_plies:
+                continue
+            fens.append(move.fen_before)
+            fens.append(move.fen_after)
+        if fens:
+            client.analyze_positions(
+                fens, depth=shallow_depth, progress_cb=progress_cb
+            )
+
+        # Adaptive second pass: only plies whose shallow centipawn loss comes
+        # anywhere near the classification thresholds pay for full depth.
+        # Quiet moves keep their shallow evaluation.
+        deep_plies: set[int] = set()
+        if shallow_depth < depth:
+            deep_fens: list[str] = []
+            for move in moves:
+                if move.ply in skip_plies:
+                    continue
+                before = client.analyze_position(move.fen_before, depth=shallow_depth)
+                after = client.analyze_position(move.fen_after, depth=shallow_depth)
+                provisional = _eval_loss_for_side(
+                    move.side_to_move.value, after["score_cp"], before["score_cp"]
+                )
+                if provisional >= _DEEP_PASS_CPL:
+                    deep_plies.add(move.ply)
+                    deep_fens.append(move.fen_before)
+                    deep_fens.append(move.fen_after)
+            if deep_fens:
+                client.analyze_positions(
+                    deep_fens, depth=depth, progress_cb=progress_cb
+                )
+
         analyzed_count = 0
 
+        # One live board replayed through the game — at the top of each
+        # iteration it holds the position of move.fen_before.
+        board: Optional[chess.Board] = None
+        if moves:
+            try:
+                board = chess.Board(moves[0].fen_before)
+            except ValueError:
+                board = None
+
+        def _advance(mv: Row) -> None:
+            nonlocal board
+            if board is None:
+                return
+            try:
+                board.push_uci(mv.uci)
+            except ValueError:
+                try:
+                    board = chess.Board(mv.fen_after)
+                except ValueError:
+                    board = None
+
+        # Analysis rows are write-once: collect plain dicts and flush them in
+        # a single executemany insert at the end — one statement and one
+        # transaction per game instead of an ORM instance per ply.
+        analysis_rows: list[dict] = []
+
         for move in moves:
-            before = self.stockfish_client.analyze_position(move.fen_before, depth=depth)
-            after = self.stockfish_client.analyze_position(move.fen_after, depth=depth)
+            if move.ply in skip_plies:
+                # Book or forced move — classify as best without engine work
+                analysis_rows.append(
+                    {
+                        "game_id": game_id,
+                        "ply": move.ply,
+                        "fen_before": move.fen_before,
+                        "move_uci": move.uci,
+                        "eval_before_cp": None,
+                        "eval_after_cp": None,
+                        "best_move_uci": None,
+                        "best_move_san": None,
+                        "centipawn_loss": 0,
+                        "classification": MoveClassification.best,
+                        "principal_variation": None,
+                        "depth": depth,
+                    }
+                )
+                analyzed_count += 1
+                _advance(move)
+                continue
+
+            ply_depth = depth if move.ply in deep_plies or shallow_depth == depth else shallow_depth
+            before = client.analyze_position(move.fen_before, depth=ply_depth)
+            after = client.analyze_position(move.fen_after, depth=ply_depth)
 
             eval_before_cp = before["score_cp"]
             eval_after_cp = after["score_cp"]
             best_move_uci = before["best_move_uci"]
 
             best_move_san: Optional[str] = None
-            best_eval_after_cp = eval_after_cp
-            if best_move_uci:
+            if best_move_uci and board is not None:
                 try:
-                    board = chess.Board(move.fen_before)
                     best_move_obj = chess.Move.from_uci(best_move_uci)
                     if best_move_obj in board.legal_moves:
                         best_move_san = board.san(best_move_obj)
-                        if best_move_uci != move.uci:
-                            board.push(best_move_obj)
-                            best_after = self.stockfish_client.analyze_position(board.fen(), depth=depth)
-                            best_eval_after_cp = best_after["score_cp"]
                 except Exception:
                     pass
 
-            cpl = _eval_loss_for_side(move.side_to_move.value, eval_after_cp, best_eval_after_cp)
-
-            db.add(
-                EngineAnalysis(
-                    game_id=game_id,
-                    ply=move.ply,
-                    fen_before=move.fen_before,
-                    move_uci=move.uci,
-                    eval_before_cp=eval_before_cp,
-                    eval_after_cp=eval_after_cp,
-                    best_move_uci=best_move_uci,
-                    best_move_san=best_move_san,
-                    centipawn_loss=cpl,
-                    classification=classify_by_cpl(cpl),
-                    principal_variation={"pv": before["pv"]},
-                    depth=depth,
-                )
+            # The before-eval already assumes best play, so it doubles as the
+            # best-move baseline — no third engine call needed per ply.
+            cpl = _eval_loss_for_side(move.side_to_move.value, eval_after_cp, eval_before_cp)
+
+            analysis_rows.append(
+                {
+                    "game_id": game_id,
+                    "ply": move.ply,
+                    "fen_before": move.fen_before,
+                    "move_uci": move.uci,
+                    "eval_before_cp": eval_before_cp,
+                    "eval_after_cp": eval_after_cp,
+                    "best_move_uci": best_move_uci,
+                    "best_move_san": best_move_san,
+                    "centipawn_loss": cpl,
+                    "classification": classify_by_cpl(cpl),
+                    # NULL instead of '{"pv": []}' when the engine returned no
+                    # line — consumers treat both as "no PV", and the empty
+                    # JSON blob otherwise gets serialized and stored per ply.
+                    "principal_variation": {"pv": before["pv"]} if before["pv"] else None,
+                    "depth": ply_depth,
+                }
             )
             analyzed_count += 1
+            _advance(move)
 
+        if analysis_rows:
+            db.execute(insert(EngineAnalysis), analysis_rows)
         db.commit()
         return analyzed_count
 
@@ -190,35 +343,63 @@ class AnalysisService:
         analyzed_games = 0
         analyzed_positions = 0
 
+        # One query up front for the games that already have analysis rows —
+        # previously a per-game existence SELECT inside the loop.
+        already_analyzed: set[str] = set()
+        if only_missing and games:
+            already_analyzed = set(
+                db.scalars(
+                    select(EngineAnalysis.game_id)
+                    .where(EngineAnalysis.game_id.in_([g.id for g in games]))
+                    .distinct()
+                ).all()
+            )
+
         self._seed_fen_cache(db, depth)
 
-        with self.stockfish_client:
-            for game in games:
-                if only_missing:
-                    existing = db.scalar(
-                        select(EngineAnalysis.id)
-                        .where(EngineAnalysis.game_id == game.id)
-                        .limit(1)
-                    )
-                    if existing is not None:
-                        continue
-
-                count = self.analyze_game(db=db, game_id=game.id, depth=depth)
-                analyzed_games += 1
-                analyzed_positions += count
-
-                # Update job progress after each game so the UI stays current
-                if job is not None:
+        # Open the pool without a context manager so the engine processes
+        # survive this run: the next job reuses warm processes (and
+        # Stockfish's internal hash table) instead of paying the subprocess
+        # spawn + UCI handshake again.
+        self.stockfish_client.open()
+
+        for game in games:
+            if only_missing and game.id in already_analyzed:
+                continue
+
+            # Surface within-game progress on the job so long games don't
+            # look stalled in the UI.  Throttled to every 25 positions.
+            progress_cb: Optional[Callable[[int, int], None]] = None
+            if job is not None:
+                def progress_cb(done: int, total_positions: int) -> None:
+                    if done % 25 and done != total_positions:
+                        return
                     job.result = {
                         "analyzed_games": analyzed_games,
                         "total_games": total,
                         "analyzed_positions": analyzed_positions,
+                        "current_game_positions": {"done": done, "total": total_positions},
                     }
                     db.commit()
 
-                logger.info(
-                    "Analyzed game %s (%d/%d) — %d positions",
-                    game.id, analyzed_games, total, count,
-                )
+            count = self.analyze_game(
+                db=db, game_id=game.id, depth=depth, progress_cb=progress_cb
+            )
+            analyzed_games += 1
+            analyzed_positions += count
+
+            # Update job progress after each game so the UI stays current
+            if job is not None:
+                job.result = {
+                    "analyzed_games": analyzed_games,
+                    "total_games": total,
+                    "analyzed_positions": analyzed_positions,
+                }
+                db.commit()
+
+            logger.info(
+                "Analyzed game %s (%d/%d) — %d positions",
+                game.id, analyzed_games, total, count,
+            )
 
         return analyzed_games, analyzed_positions
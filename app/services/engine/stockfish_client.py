@@ -1,4 +1,7 @@
-from typing import Any, Optional
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Optional
 
 import chess
 import chess.engine
@@ -7,21 +10,29 @@ from app.config import settings
 
 
 class StockfishClient:
-    """Wraps a Stockfish process with a persistent engine and in-memory FEN cache.
+    """Wraps a pool of Stockfish processes with an in-memory FEN cache.
 
-    Use as a context manager for bulk analysis so the engine process is opened
-    once and shared across all positions:
+    Use as a context manager for bulk analysis so the engine processes are
+    opened once and shared across all positions:
 
         with StockfishClient() as client:
             result = client.analyze_position(fen, depth=12)
 
     When called outside a context manager the engine is opened and closed
     per call (safe for single-position use, slower for bulk).
+
+    With ``workers > 1`` the pool holds that many independent engine
+    processes, each pinned to a single search thread; ``analyze_positions``
+    fans evaluations out across them.  python-chess engines are not
+    thread-safe, so each engine is guarded by its own lock and only ever
+    used serially.
     """
 
-    def __init__(self, path: str | None = None):
+    def __init__(self, path: str | None = None, workers: int | None = None):
         self.path = path or settings.stockfish_path
-        self._engine: Optional[chess.engine.SimpleEngine] = None
+        self.workers = max(1, workers if workers is not None else settings.engine_workers)
+        self._engines: list[chess.engine.SimpleEngine] = []
+        self._locks: list[threading.Lock] = []
         # (fen, depth) → {score_cp, best_move_uci, pv}
         self._cache: dict[tuple[str, int], dict[str, Any]] = {}
 
@@ -30,16 +41,25 @@ class StockfishClient:
     # ------------------------------------------------------------------
 
     def open(self) -> None:
-        if self._engine is None:
-            self._engine = chess.engine.SimpleEngine.popen_uci(self.path)
+        while len(self._engines) < self.workers:
+            engine = chess.engine.SimpleEngine.popen_uci(self.path)
+            if self.workers > 1:
+                # One search thread per worker — parallelism comes from the pool
+                try:
+                    engine.configure({"Threads": 1})
+                except Exception:
+                    pass
+            self._engines.append(engine)
+            self._locks.append(threading.Lock())
 
     def close(self) -> None:
-        if self._engine is not None:
+        for engine in self._engines:
             try:
-                self._engine.quit()
+                engine.quit()
             except Exception:
                 pass
-            self._engine = None
+        self._engines = []
+        self._locks = []
 
     def __enter__(self) -> "StockfishClient":
         self.open()
@@ -52,26 +72,51 @@ class StockfishClient:
     # Analysis
     # ------------------------------------------------------------------
 
-    def analyze_position(self, fen: str, depth: int = 12) -> dict[str, Any]:
-        key = (fen, depth)
+    @staticmethod
+    def _key(fen: str, depth: int) -> tuple[str, int]:
+        """Cache key: the FEN minus its halfmove/fullmove counters.
+
+        Positions reached at different move numbers (transpositions, shared
+        opening lines across games) then land on one entry.  A cheap stand-in
+        for Zobrist hashing that stays string-compatible with the FENs stored
+        on EngineAnalysis rows, so DB cache seeding needs no board parsing.
+
+        The position string is interned: the same position is keyed many
+        times (cache probe, deeper-depth probe, batch dedupe), and interned
+        strings compare by pointer on the dict fast path instead of
+        character-by-character over a ~70-char FEN prefix.
+        """
+        return sys.intern(fen.rsplit(" ", 2)[0]), depth
+
+    def analyze_position(self, fen: str, depth: int = 12, _worker: int = 0) -> dict[str, Any]:
+        key = self._key(fen, depth)
         if key in self._cache:
             return self._cache[key]
 
-        # Also accept a hit from a deeper cached result for the same FEN
+        # Also accept a hit from a deeper cached result for the same position
         for cached_depth in range(depth + 1, depth + 10):
-            deeper_key = (fen, cached_depth)
+            deeper_key = (key[0], cached_depth)
             if deeper_key in self._cache:
                 result = self._cache[deeper_key]
                 self._cache[key] = result
                 return result
 
-        opened_here = self._engine is None
+        opened_here = not self._engines
         if opened_here:
             self.open()
 
         try:
             board = chess.Board(fen)
-            info = self._engine.analyse(board, chess.engine.Limit(depth=depth))  # type: ignore[union-attr]
+            # Depth-limited search, optionally capped by a node budget: the
+            # search stops at whichever limit is reached first, so one slow
+            # position can't stall a whole batch.
+            if settings.engine_nodes:
+                limit = chess.engine.Limit(depth=depth, nodes=settings.engine_nodes)
+            else:
+                limit = chess.engine.Limit(depth=depth)
+            idx = _worker % len(self._engines)
+            with self._locks[idx]:
+                info = self._engines[idx].analyse(board, limit)
             score_cp = info["score"].white().score(mate_score=100_000)
             pv = [move.uci() for move in info.get("pv", [])]
             result = {
@@ -84,3 +129,55 @@ class StockfishClient:
         finally:
             if opened_here:
                 self.close()
+
+    def analyze_positions(
+        self,
+        fens: list[str],
+        depth: int = 12,
+        progress_cb: Optional[Callable[[int, int], None]] = None,
+    ) -> int:
+        """Evaluate many FENs, fanning out across the engine pool.
+
+        Positions already in the cache are skipped.  Returns the number of
+        positions actually sent to an engine.  Results land in the cache, so
+        subsequent ``analyze_position`` calls for the same FENs are free.
+
+        ``progress_cb(done, total)`` is invoked from the calling thread after
+        each position completes, so callers can surface progress on long
+        batches without waiting for the whole pass to finish.
+        """
+        # Derive each FEN's cache key once and reuse it for both the cache
+        # probe and the position-level dedupe.
+        todo_by_position: dict[str, str] = {}
+        for fen in fens:
+            key = self._key(fen, depth)
+            if key not in self._cache:
+                todo_by_position.setdefault(key[0], fen)
+        todo = list(todo_by_position.values())
+        if not todo:
+            return 0
+
+        opened_here = not self._engines
+        if opened_here:
+            self.open()
+
+        try:
+            if len(self._engines) == 1:
+                for n, fen in enumerate(todo, start=1):
+                    self.analyze_position(fen, depth=depth)
+                    if progress_cb is not None:
+                        progress_cb(n, len(todo))
+            else:
+                with ThreadPoolExecutor(max_workers=len(self._engines)) as pool:
+                    futures = [
+                        pool.submit(self.analyze_position, fen, depth, _worker=i)
+                        for i, fen in enumerate(todo)
+                    ]
+                    for n, future in enumerate(as_completed(futures), start=1):
+                        future.result()
+                        if progress_cb is not None:
+                            progress_cb(n, len(todo))
+            return len(todo)
+        finally:
+            if opened_here:
+                self.close()
@@ -2,10 +2,12 @@
 from __future__ import annotations
 
 import json
+import re
 import urllib.error
 import urllib.request
 
 _API_BASE = "https://api.chess.com/pub"
+_EVENT_RE = re.compile(r"^\[Event ", re.MULTILINE)
 _HEADERS = {"User-Agent": "prepagent-chess/1.0"}
 
 
@@ -52,8 +54,6 @@ def fetch_pgn(username: str, max_games: int = 500) -> str:
     collected = 0
 
     for archive_url in reversed(archives):  # newest month first
-        if collected >= max_games:
-            break
         pgn_url = f"{archive_url}/pgn"
         try:
             raw = _get(pgn_url)
@@ -64,11 +64,21 @@ def fetch_pgn(username: str, max_games: int = 500) -> str:
         if not pgn_text:
             continue
 
-        # Count games in this month's PGN block (each game starts with [Event)
-        n_games = pgn_text.count("\n[Event ") + (1 if pgn_text.startswith("[Event ") else 0)
+        # Each game starts with an [Event header
+        starts = [m.start() for m in _EVENT_RE.finditer(pgn_text)]
+        n_games = len(starts)
+        remaining = max_games - collected
+        if n_games > remaining:
+            # Keep only the newest `remaining` games from this month instead
+            # of overshooting max_games by up to a whole month's worth of
+            # games that the import would then parse and store.
+            pgn_text = pgn_text[starts[n_games - remaining]:]
+            n_games = remaining
 
         month_pgns.append(pgn_text)
         collected += n_games
+        if collected >= max_games:
+            break
 
     # Reverse so the final PGN is in chronological (oldest-first) order
     return "\n\n".join(reversed(month_pgns))
@@ -8,7 +8,6 @@ from __future__ import annotations
 import json
 import logging
 import re
-import time
 import urllib.parse
 import urllib.request
 from typing import Optional
@@ -61,7 +60,9 @@ def _candidate_usernames(display_name: str) -> list[str]:
             candidates.append(f"{pfx}{last}")
     elif len(parts) == 1:
         candidates.append(parts[0])
-    return candidates
+    # Single-word names like "Carlsen Carlsen" would otherwise yield the
+    # same candidate several times, and each duplicate costs an HTTP probe.
+    return list(dict.fromkeys(candidates))
 
 
 def _fetch_json(url: str, headers: dict, timeout: int = 8) -> Optional[dict | list]:
@@ -369,19 +370,16 @@ def _build_chesscom_result(profile: dict, title: str) -> dict:
     }
 
 
-def _real_name_matches(real_name: str, query_tokens: set[str]) -> bool:
+def _real_name_matches(real_name: str, significant_tokens: set[str]) -> bool:
     """
-    Strict real-name match: ALL significant query tokens (length >= 3) must
-    appear in the profile name. Single-letter initials in the query are ignored.
-    Returns False for empty names or when no significant tokens are present.
+    Strict real-name match: ALL significant query tokens must appear in the
+    profile name.  Callers pass the pre-filtered (length >= 3) token set —
+    it is loop-invariant across a titled-player scan, so it is built once
+    rather than per profile.  Returns False for empty names or token sets.
     """
-    if not real_name:
+    if not real_name or not significant_tokens:
         return False
-    profile_tokens = _name_tokens(real_name)
-    significant = {t for t in query_tokens if len(t) >= 3}
-    if not significant:
-        return False  # nothing meaningful to match on
-    return significant.issubset(profile_tokens)
+    return significant_tokens.issubset(_name_tokens(real_name))
 
 
 def _is_verified(profile: dict) -> bool:
@@ -443,7 +441,9 @@ def search_chesscom(display_name: str, title_hint: Optional[str] = None) -> list
          match against the `name` field returned by Chess.com. Username is
          never used for matching in this phase.
     """
-    query_tokens = _name_tokens(display_name)
+    # Significant tokens (>= 3 chars, initials dropped) are the search
+    # "needle" — derive them once here instead of per scanned profile.
+    query_tokens = {t for t in _name_tokens(display_name) if len(t) >= 3}
     if not query_tokens:
         return []
 
@@ -1,23 +1,28 @@
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
 from app.db.models import Game, Job, JobStatus, MoveFact
 from app.services.opponents.identity import OpponentIdentityService
-from app.services.parsing.pgn_parser import parse_pgn_text
+from app.services.parsing.pgn_parser import parse_pgn_text_parallel
+
+
+# Commit (and drop from the session) finished games in batches of this size.
+_COMMIT_BATCH_GAMES = 100
 
 
 def process_pgn_import_job(db: Session, job: Job, opponent_space_id: str, pgn_text: str, source: str = "upload") -> None:
     job.status = JobStatus.running
     db.commit()
 
-    parsed_games = parse_pgn_text(pgn_text)
     imported_ids: list[str] = []
     skipped = 0
 
-    opponent = job.opponent_space
+    canonical_name = job.opponent_space.canonical_name
     identity_service = OpponentIdentityService()
 
-    for parsed in parsed_games:
+    # Games arrive one at a time and are persisted as they parse; big dumps
+    # are additionally parsed across CPU cores (see parse_pgn_text_parallel).
+    for parsed in parse_pgn_text_parallel(pgn_text):
         # Skip games already in the database (same platform game ID)
         sgid = parsed.get("source_game_id")
         if sgid:
@@ -29,7 +34,7 @@ def process_pgn_import_job(db: Session, job: Job, opponent_space_id: str, pgn_te
                 continue
 
         identity = identity_service.infer_side(
-            canonical_name=opponent.canonical_name,
+            canonical_name=canonical_name,
             white_name=parsed["white_name"],
             black_name=parsed["black_name"],
         )
@@ -58,27 +63,31 @@ def process_pgn_import_job(db: Session, job: Job, opponent_space_id: str, pgn_te
         db.add(game)
         db.flush()
 
-        for idx, mv in enumerate(parsed["moves"], start=1):
-            db.add(
-                MoveFact(
-                    game_id=game.id,
-                    ply=idx,
-                    fullmove_number=mv["fullmove_number"],
-                    side_to_move=mv["side_to_move"],
-                    san=mv["san"],
-                    uci=mv["uci"],
-                    fen_before=mv["fen_before"],
-                    fen_after=mv["fen_after"],
-                    phase=mv["phase"],
-                    is_book=mv["is_book"],
-                    clock_before_ms=mv.get("clock_before_ms"),
-                    clock_after_ms=mv.get("clock_after_ms"),
-                    movetime_ms=mv.get("movetime_ms"),
-                )
-            )
+        # The parser emits each move as a dict whose keys are exactly the
+        # MoveFact columns, so the rows go straight to an executemany bulk
+        # insert — no per-move ORM instance construction, attribute
+        # instrumentation, or identity-map tracking for rows that are
+        # write-once anyway.
+        move_rows = [
+            {"game_id": game.id, "ply": idx, **mv}
+            for idx, mv in enumerate(parsed["moves"], start=1)
+        ]
+        if move_rows:
+            db.execute(insert(MoveFact), move_rows)
 
         imported_ids.append(game.id)
 
+        # Flush finished games out of the session in batches — a
+        # multi-thousand-game import otherwise holds every Game object in
+        # the identity map until the final commit (MoveFacts bypass the
+        # session via the bulk insert).  The Job (and anything else) stays
+        # attached; callers update it on failure.
+        if len(imported_ids) % _COMMIT_BATCH_GAMES == 0:
+            db.commit()
+            for obj in list(db.identity_map.values()):
+                if isinstance(obj, Game):
+                    db.expunge(obj)
+
     job.status = JobStatus.completed
     job.result = {
         "imported_games": len(imported_ids),
@@ -1,30 +1,47 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
 from app.db.models import Side
 
 
-@dataclass
+# slots=True: one of these is built per imported game, and a slotted
+# instance is both smaller and faster to construct than a __dict__-backed one.
+@dataclass(slots=True)
 class IdentityMatchResult:
     matched_name: Optional[str]
     opponent_side: Optional[Side]
     confidence: float
 
 
+# Module-level caches: infer_side runs once per imported game, and the
+# canonical name (plus recurring player names in bulk PGN dumps) is
+# re-normalized every time — memoize the pure string work.
+
+@lru_cache(maxsize=2048)
+def _normalize_name(value: str) -> str:
+    return "".join(ch.lower() for ch in value.strip() if ch.isalnum())
+
+
+@lru_cache(maxsize=2048)
+def _tokenize_name(value: str) -> frozenset[str]:
+    return frozenset(t.lower() for t in value.replace(",", " ").split() if len(t) >= 3)
+
+
 class OpponentIdentityService:
     def normalize_name(self, value: str | None) -> str:
         if not value:
             return ""
-        return "".join(ch.lower() for ch in value.strip() if ch.isalnum())
+        return _normalize_name(value)
 
-    def _name_tokens(self, value: str | None) -> set[str]:
+    def _name_tokens(self, value: str | None) -> frozenset[str]:
         """Split a name into lowercase word tokens, ignoring commas.
         Tokens shorter than 3 chars are excluded to avoid spurious matches."""
         if not value:
-            return set()
-        return {t.lower() for t in value.replace(",", " ").split() if len(t) >= 3}
+            return frozenset()
+        return _tokenize_name(value)
 
     def infer_side(
         self,
@@ -16,7 +16,6 @@ import logging
 import os
 import pickle
 import urllib.request
-from functools import lru_cache
 from typing import Optional
 
 import chess
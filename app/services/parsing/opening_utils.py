@@ -4,6 +4,16 @@ from typing import Optional
 
 from app.services.parsing.opening_book import lookup_opening
 
+# The deepest line in the lichess ECO book is well under 40 plies, so
+# replaying beyond that can never produce a new match.
+_MAX_BOOK_PLIES = 40
+
+# Joined-SAN prefix → (eco, name).  Games from the same player repeat the
+# same opening lines constantly; the cache turns the board replay into a
+# single dict lookup for repeats.
+_detect_cache: dict[str, tuple[Optional[str], Optional[str]]] = {}
+_DETECT_CACHE_MAX = 4096
+
 
 def detect_opening_from_moves(moves_san: list[str]) -> tuple[Optional[str], Optional[str]]:
     """
@@ -15,11 +25,17 @@ def detect_opening_from_moves(moves_san: list[str]) -> tuple[Optional[str], Opti
     """
     import chess
 
+    prefix = moves_san[:_MAX_BOOK_PLIES]
+    key = " ".join(prefix)
+    cached = _detect_cache.get(key)
+    if cached is not None:
+        return cached
+
     board = chess.Board()
     best_eco: Optional[str] = None
     best_name: Optional[str] = None
 
-    for san in moves_san:
+    for san in prefix:
         try:
             move = board.parse_san(san)
         except Exception:
@@ -30,4 +46,7 @@ def detect_opening_from_moves(moves_san: list[str]) -> tuple[Optional[str], Opti
         if result:
             best_eco, best_name = result
 
+    if len(_detect_cache) >= _DETECT_CACHE_MAX:
+        _detect_cache.clear()
+    _detect_cache[key] = (best_eco, best_name)
     return best_eco, best_name
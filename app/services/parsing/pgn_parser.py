@@ -1,7 +1,9 @@
 import io
+import os
 import re
-from datetime import date, datetime
-from typing import Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Any, Iterator, Optional, TextIO
 
 import chess
 import chess.pgn
@@ -14,14 +16,17 @@ _CLK_RE = re.compile(r'\[%clk\s+(\d+):(\d+):(\d+(?:\.\d+)?)\]')
 
 
 def infer_phase(board: chess.Board, ply: int) -> Phase:
+    # Early plies are opening by ply number alone — skip the piece counts.
+    if ply <= 20:
+        return Phase.opening
     queens = len(board.pieces(chess.QUEEN, chess.WHITE)) + len(board.pieces(chess.QUEEN, chess.BLACK))
+    if queens:
+        return Phase.middlegame
     minor_and_rooks = sum(
         len(board.pieces(piece, chess.WHITE)) + len(board.pieces(piece, chess.BLACK))
         for piece in [chess.ROOK, chess.BISHOP, chess.KNIGHT]
     )
-    if ply <= 20:
-        return Phase.opening
-    if queens == 0 and minor_and_rooks <= 4:
+    if minor_and_rooks <= 4:
         return Phase.endgame
     return Phase.middlegame
 
@@ -71,16 +76,30 @@ def _extract_source_game_id(headers: chess.pgn.Headers) -> Optional[str]:
 def parse_game_date(date_str: Optional[str]) -> Optional[date]:
     if not date_str or "?" in date_str:
         return None
+    # Direct split instead of strptime — this runs once per imported game and
+    # the PGN Date header is always "YYYY.MM.DD".
     try:
-        return datetime.strptime(date_str, "%Y.%m.%d").date()
+        year, month, day = date_str.split(".")
+        return date(int(year), int(month), int(day))
     except ValueError:
         return None
 
 
 
-def parse_single_game(game: chess.pgn.Game, raw_pgn_text: str) -> dict[str, Any]:
+def parse_single_game(
+    game: chess.pgn.Game,
+    raw_pgn_text: str,
+    board: Optional[chess.Board] = None,
+) -> dict[str, Any]:
     headers = game.headers
-    board = game.board()
+    # Reuse the caller's board when the game starts from the standard
+    # position — reset() is much cheaper than Board.__init__'s bitboard
+    # setup, and nearly every game in a bulk dump is a standard game.
+    # Custom setups and variants still get a fresh board from the headers.
+    if board is None or "FEN" in headers or "Variant" in headers:
+        board = game.board()
+    else:
+        board.reset()
     moves: list[dict[str, Any]] = []
     san_moves: list[str] = []
 
@@ -89,14 +108,17 @@ def parse_single_game(game: chess.pgn.Game, raw_pgn_text: str) -> dict[str, Any]
 
     ply = 0
     node = game
+    # Each ply's fen_after is the next ply's fen_before, so carry the string
+    # forward and serialize every position exactly once.
+    fen_before = board.fen()
     while node.variations:
         next_node = node.variation(0)
         move = next_node.move
-        fen_before = board.fen()
-        san = board.san(move)
         side_to_move = Side.white if board.turn == chess.WHITE else Side.black
         fullmove_number = board.fullmove_number
-        board.push(move)
+        # san_and_push renders the SAN as part of making the move — board.san
+        # followed by board.push would apply and unwind the move twice.
+        san = board.san_and_push(move)
         ply += 1
         fen_after = board.fen()
 
@@ -125,6 +147,7 @@ def parse_single_game(game: chess.pgn.Game, raw_pgn_text: str) -> dict[str, Any]
             }
         )
         san_moves.append(san)
+        fen_before = fen_after
         node = next_node
 
     eco = headers.get("ECO") if headers.get("ECO") not in {None, "?"} else None
@@ -184,17 +207,55 @@ def parse_single_game(game: chess.pgn.Game, raw_pgn_text: str) -> dict[str, Any]
 
 
 
-def parse_pgn_text(pgn_text: str) -> list[dict[str, Any]]:
-    games: list[dict[str, Any]] = []
-    stream = io.StringIO(pgn_text)
+def parse_pgn_stream(stream: TextIO) -> Iterator[dict[str, Any]]:
+    """Yield parsed games one at a time from a text stream.
 
+    chess.pgn.read_game consumes the stream incrementally, so a multi-MB
+    PGN dump never has to be materialized as a list of parsed games — callers
+    can persist each game as it arrives.  The per-game PGN text is
+    re-exported from the parsed game (comments and clock annotations are
+    preserved by the exporter).
+    """
+    board = chess.Board()  # shared replay board, reset per standard game
     while True:
-        start_pos = stream.tell()
         game = chess.pgn.read_game(stream)
         if game is None:
             break
-        end_pos = stream.tell()
-        raw_game_text = pgn_text[start_pos:end_pos].strip()
-        games.append(parse_single_game(game, raw_game_text))
+        yield parse_single_game(game, str(game).strip(), board=board)
+
 
-    return games
+def parse_pgn_text(pgn_text: str) -> list[dict[str, Any]]:
+    return list(parse_pgn_stream(io.StringIO(pgn_text)))
+
+
+# Below this many games a process pool costs more in startup + pickling than
+# it saves in parse time.
+_PARALLEL_MIN_GAMES = 64
+
+
+def parse_pgn_text_parallel(
+    pgn_text: str, max_workers: Optional[int] = None
+) -> Iterator[dict[str, Any]]:
+    """Parse a multi-game PGN dump, fanning out across CPU cores.
+
+    Parsing is pure CPU work (board replay, SAN rendering, FEN
+    serialization), so a large dump is split at game boundaries into one
+    chunk per worker and the chunks are parsed in separate processes.  Small
+    dumps fall back to the streaming single-process parse.  Games are
+    yielded in their original order either way.
+    """
+    starts = [m.start() for m in re.finditer(r"^\[Event ", pgn_text, re.MULTILINE)]
+    workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+    if len(starts) < _PARALLEL_MIN_GAMES or workers <= 1:
+        yield from parse_pgn_stream(io.StringIO(pgn_text))
+        return
+
+    bounds = starts + [len(pgn_text)]
+    per_chunk = -(-len(starts) // workers)  # ceil division
+    chunks = [
+        pgn_text[bounds[i] : bounds[min(i + per_chunk, len(starts))]]
+        for i in range(0, len(starts), per_chunk)
+    ]
+    with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+        for chunk_result in pool.map(parse_pgn_text, chunks):
+            yield from chunk_result